@@ -33,6 +33,8 @@ Usage:
                   [--col_type_width=<arg>] 
                   [--col_priority_width=<arg>]
                   [--col_desc_width=<arg>]
+                  [--classify_cache=<arg>]
+                  [--classify_workers=<arg>]
   fixed_issues.py (-h | --help)
 Options:
   -h --help                         Show this screen.
@@ -55,6 +57,10 @@ Options:
   --col_type_width=<arg>            The width of the Issue Type column [default: 15].
   --col_priority_width=<arg>        The width of the Issue Priority column [default: 10].
   --col_desc_width=<arg>            The width of the Description column [default: 60].
+  --classify_cache=<arg>            JSON file caching the PR changed file classification by head sha
+                                      [default: fixed_issues_cache.json].
+  --classify_workers=<arg>          The number of PRs to fetch and classify in parallel, too many can hit
+                                      Github's secondary rate limits [default: 8].
   
 Sample json file contents:
 
@@ -77,6 +83,7 @@ import docopt
 import json
 from github import Github
 from lib.Table import TableRST, TableMD
+from lib.Classify import PRClassifier
 import itertools
 import os.path
 import time
@@ -141,6 +148,10 @@ if __name__ == '__main__':
     issue_type_len = int(args['--col_type_width'])
     issue_priority_len = int(args['--col_priority_width'])
     desc_len = int(args['--col_desc_width'])
+
+#     classification settings
+    classify_cache = args['--classify_cache']
+    classify_workers = int(args['--classify_workers'])
     
     outputfile = str(os.path.splitext(args['--config'])[0])+".rst"
 ##
@@ -241,6 +252,15 @@ if __name__ == '__main__':
     print("Removing reverted commits..")
     # removed reverted PRs from the merged list
     merged = [pr for pr in merged if pr not in reverted]
+
+    print("Classifying %s PRs using %s workers.." % (len(merged), classify_workers))
+    # derive the issue type and priority of each PR from its labels, title and changed files
+    # each worker gets its own github client as PyGithub connections are not thread safe
+    classifier = PRClassifier(lambda: Github(gh_token).get_repo(repo_name),
+                              cache_file=classify_cache, workers=classify_workers)
+    classified = classifier.classify(merged)
+    # skip any PRs which could not be fetched from github
+    merged = [pr_num for pr_num in merged if pr_num in classified]
     
     print("Creating table..")
 
@@ -268,15 +288,13 @@ if __name__ == '__main__':
     # process all officially merged PRs
     links = []
     for pr_num in merged:
-        pr = repo.get_pull(pr_num)
+        pr, issue_type, issue_priority = classified[pr_num]
         # setup github pr url
         gh_url = '%s%s' % (gh_base_url, pr_num)
         links.append('.. _`#%s`: %s' % (pr_num, gh_url))
         # initialize the data using github pr data
         desc = pr.title.strip()
         branch = pr.base.ref
-        issue_type = ''
-        issue_priority = ''
         jira_ticket = ''
         jira_url = ''
 
@@ -0,0 +1,235 @@
+#!/usr/bin/env python
+
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+from multiprocessing.pool import ThreadPool
+import json
+import os.path
+import re
+import threading
+
+# github labels mapped to the jira issue types and priorities we used to report
+LABEL_TYPES = {
+    'type:bug': 'Bug',
+    'bug': 'Bug',
+    'type:new-feature': 'New Feature',
+    'type:feature': 'New Feature',
+    'new feature': 'New Feature',
+    'type:enhancement': 'Improvement',
+    'enhancement': 'Improvement',
+    'type:cleanup': 'Task',
+    'type:documentation': 'Task',
+    'documentation': 'Task',
+    'type:test': 'Test',
+}
+LABEL_PRIORITIES = {
+    'severity:blocker': 'Blocker',
+    'severity:critical': 'Critical',
+    'severity:major': 'Major',
+    'severity:minor': 'Minor',
+    'severity:trivial': 'Trivial',
+    'security': 'Critical',
+}
+
+# title keywords, checked in order so the first match wins
+TITLE_TYPES = [
+    (re.compile(r'\b(fix|fixes|fixed|fixing|bug|bugfix|hotfix|revert|regression|npe)\b'), 'Bug'),
+    (re.compile(r'\b(feat|feature|new feature)\b'), 'New Feature'),
+    (re.compile(r'\b(improve|improvement|enhance|enhancement|refactor|perf|optimi[sz]e)\b'), 'Improvement'),
+    (re.compile(r'\b(test|tests|testing|marvin)\b'), 'Test'),
+    (re.compile(r'\b(doc|docs|readme|cleanup|clean up|chore|build|typo)\b'), 'Task'),
+]
+TITLE_PRIORITIES = [
+    (re.compile(r'\b(blocker)\b'), 'Blocker'),
+    (re.compile(r'\b(critical|security|cve|regression)\b'), 'Critical'),
+    (re.compile(r'\b(typo|typos|spelling|whitespace)\b'), 'Trivial'),
+]
+
+# changed file paths which identify a PR as only touching tests or docs/packaging
+TEST_PATHS = re.compile(r'((^|/)tests?/|/src/test/|(^|/)test_[^/]*\.py$)')
+TASK_PATHS = re.compile(r'(\.(md|rst|txt)$|^(debian|packaging|tools|\.github)/|(^|/)pom\.xml$)')
+
+DEFAULT_TYPE = 'Improvement'
+DEFAULT_PRIORITY = 'Major'
+MINOR_TYPES = ['Test', 'Task']
+
+# the number of changed files github returns on the first page of a PR's files
+FILES_PAGE_SIZE = 30
+
+
+class PRClassifier(object):
+    """
+    Derives the issue type and priority of merged pull requests from their labels,
+    titles and changed file paths, without needing a Jira lookup.
+    classifier = PRClassifier(lambda: Github(<token>).get_repo(<repo_name>),
+                              cache_file='<cache.json>', workers=8)
+    results = classifier.classify([<pr_num_1>, <pr_num_2>, ...])
+    pr, issue_type, issue_priority = results[<pr_num_1>]
+
+    The type comes from the labels, then the title, then the changed file paths.
+    Only the changed file paths cost an extra API call, so only that result is
+    cached (by the PR head sha); labels and titles are re-checked on every run.
+
+    PyGithub clients are not thread safe, so 'get_repo' is called once per worker
+    thread to give each worker its own client.  Too many workers can trip Github's
+    secondary rate limits, so keep 'workers' small.
+    """
+
+    def __init__(self, get_repo, cache_file=None, workers=8):
+        self.get_repo = get_repo
+        self.local = threading.local()
+        self.cache_file = cache_file
+        self.workers = max(1, workers)
+        self.cache = {}
+        self.lock = threading.Lock()
+        if self.cache_file and os.path.isfile(self.cache_file):
+            try:
+                with open(self.cache_file) as json_file:
+                    self.cache = json.load(json_file)
+            except Exception as e:
+                print("Failed to load classification cache '%s'" % self.cache_file)
+                print("ERROR: %s" % str(e))
+            if not isinstance(self.cache, dict):
+                print("Ignoring classification cache '%s', it is not a JSON object" % self.cache_file)
+                self.cache = {}
+
+
+    def repo(self):
+        """
+        Return the github repo for the current worker thread, creating it on first use.
+        """
+        if not hasattr(self.local, 'repo'):
+            self.local.repo = self.get_repo()
+        return self.local.repo
+
+
+    def classify(self, pr_nums):
+        """
+        Classify all the PRs in 'pr_nums' in parallel and save the updated cache.
+        Returns a dict of pr_num => (pull_request, issue_type, issue_priority).
+        PRs which could not be fetched are left out of the result.
+        """
+        pr_nums = list(set(pr_nums))
+        pool = ThreadPool(self.workers)
+        try:
+            results = pool.map(self.classify_pr, pr_nums)
+        finally:
+            pool.close()
+            pool.join()
+            self.save()
+        return dict((pr_num, result) for pr_num, result in zip(pr_nums, results) if result)
+
+
+    def classify_pr(self, pr_num):
+        """
+        Fetch and classify a single PR.  Returns None if the PR could not be fetched.
+        """
+        try:
+            pr = self.repo().get_pull(pr_num)
+            labels = [l.name.strip().lower() for l in pr.labels]
+            title = pr.title.strip().lower()
+        except Exception as e:
+            print('ERROR: unable to get PR #%s: %s' % (pr_num, str(e)))
+            return None
+
+        issue_type = ''
+        for label in labels:
+            if label in LABEL_TYPES:
+                issue_type = LABEL_TYPES[label]
+                break
+        if not issue_type:
+            for regex, title_type in TITLE_TYPES:
+                if regex.search(title):
+                    issue_type = title_type
+                    break
+        if not issue_type:
+            issue_type = self.cached_type_from_paths(pr)
+        if not issue_type:
+            issue_type = DEFAULT_TYPE
+
+        issue_priority = ''
+        for label in labels:
+            if label in LABEL_PRIORITIES:
+                issue_priority = LABEL_PRIORITIES[label]
+                break
+        if not issue_priority:
+            for regex, title_priority in TITLE_PRIORITIES:
+                if regex.search(title):
+                    issue_priority = title_priority
+                    break
+        if not issue_priority:
+            issue_priority = 'Minor' if issue_type in MINOR_TYPES else DEFAULT_PRIORITY
+
+        return (pr, issue_type, issue_priority)
+
+
+    def cached_type_from_paths(self, pr):
+        """
+        Return the `type_from_paths` result for the PR head sha, only calling the API on a cache miss.
+        Only the first page of changed files is requested to bound the API calls per PR, so PRs
+        with more changed files than that are never classified by path.
+        """
+        if pr.changed_files > FILES_PAGE_SIZE:
+            return ''
+        try:
+            sha = pr.head.sha
+        except Exception as e:
+            print('ERROR: unable to get the head sha for PR #%s: %s' % (pr.number, str(e)))
+            return ''
+        with self.lock:
+            if sha in self.cache:
+                return self.cache[sha]
+        path_type = self.type_from_paths(pr)
+        if path_type is not None:
+            with self.lock:
+                self.cache[sha] = path_type
+        return path_type or ''
+
+
+    def type_from_paths(self, pr):
+        """
+        Return 'Test' or 'Task' if every changed file is a test or a doc/packaging file, otherwise ''.
+        Returns None if the files could not be fetched, so the result is not cached.
+        """
+        try:
+            paths = [f.filename for f in pr.get_files().get_page(0)]
+        except Exception as e:
+            print('ERROR: unable to get the files for PR #%s: %s' % (pr.number, str(e)))
+            return None
+        if not paths:
+            return ''
+        if all(TEST_PATHS.search(p) for p in paths):
+            return 'Test'
+        if all(TASK_PATHS.search(p) for p in paths):
+            return 'Task'
+        return ''
+
+
+    def save(self):
+        """
+        Write the classification cache to 'cache_file' (if one was given).
+        """
+        if not self.cache_file:
+            return
+        try:
+            with self.lock:
+                with open(self.cache_file, 'w') as json_file:
+                    json.dump(self.cache, json_file, indent=4, sort_keys=True)
+        except Exception as e:
+            print("Failed to save classification cache '%s'" % self.cache_file)
+            print("ERROR: %s" % str(e))
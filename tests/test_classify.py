@@ -0,0 +1,177 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from lib.Classify import PRClassifier
+
+
+class Obj(object):
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class FakeFiles(object):
+    def __init__(self, repo, paths):
+        self.repo = repo
+        self.paths = paths
+
+    def get_page(self, page):
+        with self.repo.lock:
+            self.repo.files_calls += 1
+        return [Obj(filename=p) for p in self.paths[:30]]
+
+
+class FakeRepo(object):
+    """
+    Stands in for a PyGithub repo, with pulls = {<pr_num>: (<title>, [<labels>], [<paths>])}.
+    """
+    def __init__(self, pulls):
+        self.pulls = pulls
+        self.files_calls = 0
+        self.lock = threading.Lock()
+        self.clients = []
+        self.shared_calls = 0
+
+    def get_repo(self):
+        """
+        Return a client for the calling thread, like `Github(token).get_repo(name)`.
+        """
+        client = FakeClient(self)
+        with self.lock:
+            self.clients.append(client)
+        return client
+
+
+class FakeClient(object):
+    """
+    A per thread client which records any use from a thread other than the one that created it.
+    """
+    def __init__(self, repo):
+        self.repo = repo
+        self.owner = threading.current_thread()
+
+    def get_pull(self, pr_num):
+        if threading.current_thread() is not self.owner:
+            with self.repo.lock:
+                self.repo.shared_calls += 1
+        pulls = self.repo.pulls
+        if pr_num not in pulls:
+            raise IOError('404 Not Found')
+        title, labels, paths = pulls[pr_num]
+        return Obj(
+            number=pr_num,
+            title=title,
+            labels=[Obj(name=l) for l in labels],
+            head=Obj(sha='sha%s' % pr_num),
+            changed_files=len(paths),
+            get_files=lambda: FakeFiles(self.repo, paths))
+
+
+class TestPRClassifier(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_file = os.path.join(self.tmp_dir, 'cache.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def classify(self, repo, pr_nums):
+        return PRClassifier(repo.get_repo, cache_file=self.cache_file, workers=4).classify(pr_nums)
+
+    def test_labels_take_priority_over_title(self):
+        repo = FakeRepo({1: ('Fix typo in docs', ['type:new-feature', 'Severity:Critical'], ['a.java'])})
+        _, issue_type, issue_priority = self.classify(repo, [1])[1]
+        self.assertEqual(issue_type, 'New Feature')
+        self.assertEqual(issue_priority, 'Critical')
+
+    def test_title_takes_priority_over_paths(self):
+        repo = FakeRepo({1: ('Fix flaky NPE', [], ['test/integration/smoke/test_vm.py'])})
+        _, issue_type, issue_priority = self.classify(repo, [1])[1]
+        self.assertEqual(issue_type, 'Bug')
+        self.assertEqual(issue_priority, 'Major')
+        self.assertEqual(repo.files_calls, 0)
+
+    def test_minor_default_priority_for_test_and_task(self):
+        repo = FakeRepo({
+            1: ('Something', [], ['test/integration/smoke/test_vm.py']),
+            2: ('Something else', [], ['README.md', 'debian/control']),
+        })
+        results = self.classify(repo, [1, 2])
+        self.assertEqual(results[1][1:], ('Test', 'Minor'))
+        self.assertEqual(results[2][1:], ('Task', 'Minor'))
+
+    def test_large_prs_are_not_classified_by_path(self):
+        paths = ['test/t%02d.py' % i for i in range(40)] + ['ui/src/app.js']
+        repo = FakeRepo({1: ('Something', [], paths)})
+        self.assertEqual(self.classify(repo, [1])[1][1:], ('Improvement', 'Major'))
+        self.assertEqual(repo.files_calls, 0)
+
+    def test_cache_hit_skips_get_files(self):
+        pulls = {1: ('Something', [], ['test/integration/smoke/test_vm.py'])}
+        repo = FakeRepo(pulls)
+        self.classify(repo, [1])
+        self.assertEqual(repo.files_calls, 1)
+        with open(self.cache_file) as json_file:
+            self.assertEqual(json.load(json_file), {'sha1': 'Test'})
+
+        repo = FakeRepo(pulls)
+        self.assertEqual(self.classify(repo, [1])[1][1:], ('Test', 'Minor'))
+        self.assertEqual(repo.files_calls, 0)
+
+    def test_labels_are_rechecked_on_cache_hit(self):
+        repo = FakeRepo({1: ('Something', [], ['test/integration/smoke/test_vm.py'])})
+        self.classify(repo, [1])
+        repo = FakeRepo({1: ('Something', ['type:bug'], ['test/integration/smoke/test_vm.py'])})
+        self.assertEqual(self.classify(repo, [1])[1][1:], ('Bug', 'Major'))
+
+    def test_failed_pr_is_skipped_and_cache_saved(self):
+        repo = FakeRepo({1: ('Something', [], ['README.md'])})
+        results = self.classify(repo, [1, 2])
+        self.assertEqual(list(results.keys()), [1])
+        self.assertTrue(os.path.isfile(self.cache_file))
+
+    def test_each_worker_has_its_own_client(self):
+        repo = FakeRepo(dict((i, ('Fix %s' % i, [], ['a.java'])) for i in range(50)))
+        results = self.classify(repo, list(range(50)))
+        self.assertEqual(len(results), 50)
+        self.assertEqual(repo.shared_calls, 0)
+        self.assertTrue(1 <= len(repo.clients) <= 4)
+
+    def test_large_pr_result_is_not_cached(self):
+        paths = ['test/t%02d.py' % i for i in range(40)]
+        self.classify(FakeRepo({1: ('Something', [], paths)}), [1])
+        with open(self.cache_file) as json_file:
+            self.assertEqual(json.load(json_file), {})
+
+    def test_cache_which_is_not_an_object_is_ignored(self):
+        with open(self.cache_file, 'w') as json_file:
+            json.dump(['not', 'a', 'dict'], json_file)
+        repo = FakeRepo({1: ('Something', [], ['README.md'])})
+        self.assertEqual(self.classify(repo, [1])[1][1:], ('Task', 'Minor'))
+        with open(self.cache_file) as json_file:
+            self.assertEqual(json.load(json_file), {'sha1': 'Task'})
+
+
+if __name__ == '__main__':
+    unittest.main()